@@ -5,6 +5,7 @@
 # alerts, and fallback supplier options.
 # ============================================================
 
+import asyncio
 import logging
 
 from fastapi import APIRouter, HTTPException
@@ -27,7 +28,8 @@ router = APIRouter(
 @router.get("/risk-scores")
 async def handle_risk_scores():
     try:
-        risk_scores = get_risk_scores()
+        loop = asyncio.get_running_loop()
+        risk_scores = await loop.run_in_executor(None, get_risk_scores)
         return {
             "status": "success",
             "count": len(risk_scores),
@@ -41,7 +43,8 @@ async def handle_risk_scores():
 @router.get("/compliance-alerts")
 async def handle_compliance_alerts():
     try:
-        results = get_compliance_alerts()
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(None, get_compliance_alerts)
         return {"status": "success", "count": len(results), "alerts": results}
     except Exception as exc:
         logger.error("Failed to fetch compliance alerts: %s", exc)
@@ -51,7 +54,8 @@ async def handle_compliance_alerts():
 @router.get("/fallback-options/{material_id}")
 async def handle_fallback_options(material_id: str):
     try:
-        results = get_fallback_options(material_id)
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(None, get_fallback_options, material_id)
         return {
             "status": "success",
             "count": len(results),
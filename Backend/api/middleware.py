@@ -0,0 +1,97 @@
+# ============================================================
+# api/middleware.py — Layer 1: HTTP Middleware
+#
+# ASGI middleware shared by every router.  Response compression
+# comes from Starlette's GZipMiddleware (registered in main.py);
+# this module adds the missing half — transparently inflating
+# request bodies sent with "Content-Encoding: gzip", so large
+# batch uploads can be compressed on the wire.
+# ============================================================
+
+import zlib
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Upper bound on an inflated request body (guards against
+# decompression bombs).
+MAX_DECOMPRESSED_BODY_BYTES = 32 * 1024 * 1024
+
+
+class GZipRequestMiddleware:
+    """
+    Decompress gzip-encoded request bodies before routing.
+
+    Requests without ``Content-Encoding: gzip`` pass through
+    untouched.  For gzip requests the whole body is read,
+    inflated, and replayed to the app with the
+    ``Content-Encoding`` header removed and ``Content-Length``
+    updated, so Pydantic / FastAPI see plain JSON.
+
+    Responds with 400 for a corrupt or truncated stream and 413
+    when the inflated body exceeds ``max_size`` bytes.
+    """
+
+    def __init__(self, app: ASGIApp, max_size: int = MAX_DECOMPRESSED_BODY_BYTES) -> None:
+        self.app = app
+        self.max_size = max_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if headers.get("content-encoding", "").lower() != "gzip":
+            await self.app(scope, receive, send)
+            return
+
+        # ---- Read the full compressed body ----
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+
+        # ---- Inflate with a size cap ----
+        inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            body = inflater.decompress(b"".join(chunks), self.max_size + 1)
+        except zlib.error as exc:
+            response = JSONResponse({"detail": f"Invalid gzip request body: {exc}"}, status_code=400)
+            await response(scope, receive, send)
+            return
+
+        if len(body) > self.max_size:
+            response = JSONResponse({"detail": "Decompressed request body is too large."}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        if not inflater.eof:
+            response = JSONResponse({"detail": "Invalid gzip request body: truncated stream"}, status_code=400)
+            await response(scope, receive, send)
+            return
+
+        # ---- Replay the plain body with corrected headers ----
+        raw_headers = [
+            (name, value)
+            for name, value in scope["headers"]
+            if name not in (b"content-encoding", b"content-length")
+        ]
+        raw_headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        scope = dict(scope, headers=raw_headers)
+
+        body_sent = False
+
+        async def receive_plain() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app(scope, receive_plain, send)
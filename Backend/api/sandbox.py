@@ -17,11 +17,24 @@ import io
 import logging
 
 import pdfplumber
-from fastapi import APIRouter, File, HTTPException, UploadFile
-
-from models.schemas import ConfirmedSLA, IoTTelemetryEvent, ManagerAlert, SLAContract
+from fastapi import APIRouter, File, HTTPException, Request, UploadFile
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+
+from models.schemas import (
+    SLA_LIST_ADAPTER,
+    ConfirmedSLA,
+    IoTTelemetryEvent,
+    ManagerAlert,
+    SLAContract,
+)
 from services.dashboard_service import get_impacted_products
-from services.lifting_service import persist_confirmed_sla, save_sla_contract, to_sla_contract
+from services.lifting_service import (
+    persist_confirmed_sla,
+    save_sla_contract,
+    save_sla_contracts_concurrently,
+    to_sla_contract,
+)
 from services.llm_service import run_extraction_pipeline
 from services.risk_engine_service import process_iot_event
 
@@ -52,21 +65,21 @@ def _extract_text_from_pdf(file_bytes: bytes) -> str:
     return raw
 
 
+# Human-readable confirmation for /upload-sla, filled from the
+# repository result.  Machine clients can skip it with ?verbose=false.
+_UPLOAD_SLA_MSG = "SLA contract saved to GraphDB. Inserted: ({supplier}) :supplies ({material})"
+
+
 @router.post("/upload-sla")
-async def upload_sla(contract: SLAContract):
+async def upload_sla(contract: SLAContract, verbose: bool = True):
     try:
         loop = asyncio.get_running_loop()
         graph_result = await loop.run_in_executor(None, save_sla_contract, contract)
 
-        return {
-            "status": "success",
-            "message": (
-                f"SLA contract saved to GraphDB. "
-                f"Inserted: ({graph_result['supplier']})"
-                f" :supplies ({graph_result['material']})"
-            ),
-            "graph_data": graph_result,
-        }
+        response = {"status": "success", "graph_data": graph_result}
+        if verbose:
+            response["message"] = _UPLOAD_SLA_MSG.format_map(graph_result)
+        return response
 
     except Exception as e:
         raise HTTPException(
@@ -78,6 +91,68 @@ async def upload_sla(contract: SLAContract):
         )
 
 
+# The batch body is decoded with the prebuilt SLA_LIST_ADAPTER
+# instead of a list[SLAContract] parameter, so the OpenAPI body
+# schema is declared by hand here.
+_SLA_BATCH_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {
+                    "type": "array",
+                    "items": {"$ref": "#/components/schemas/SLAContract"},
+                },
+            },
+        },
+    },
+}
+
+
+@router.post("/upload-sla-batch", openapi_extra=_SLA_BATCH_OPENAPI)
+async def upload_sla_batch(request: Request):
+    try:
+        contracts = SLA_LIST_ADAPTER.validate_json(await request.body())
+    except ValidationError as exc:
+        raise RequestValidationError(
+            [
+                {**error, "loc": ("body", *error["loc"])}
+                for error in exc.errors(include_url=False)
+            ]
+        )
+
+    try:
+        graph_result = await save_sla_contracts_concurrently(contracts)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=(
+                "Failed to save SLA contract batch to GraphDB. "
+                f"Reason: {str(e)}"
+            ),
+        )
+
+    if graph_result["failed"] and not graph_result["count"]:
+        raise HTTPException(
+            status_code=500,
+            detail=(
+                "Failed to save SLA contract batch to GraphDB. "
+                f"Reason: {'; '.join(graph_result['errors'])}"
+            ),
+        )
+
+    return {
+        "status": "partial" if graph_result["failed"] else "success",
+        "count": graph_result["count"],
+        "failed": graph_result["failed"],
+        "message": (
+            f"{graph_result['count']} SLA contract(s) saved to GraphDB "
+            f"in {graph_result['updates']} update(s)."
+        ),
+        "graph_data": graph_result,
+    }
+
+
 @router.get("/impacted-products")
 async def get_impacted_products_endpoint():
     try:
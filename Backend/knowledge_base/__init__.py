@@ -1,12 +1,13 @@
 # ============================================================
 # database/__init__.py — Package Initialisation
 #
-# Exposes the GraphDB connection singleton and
+# Exposes the lazy GraphDB connection accessor and
 # repository functions for convenient imports.
 # ============================================================
 
-from knowledge_base.connection import graphdb
+from knowledge_base.connection import get_graphdb
 from knowledge_base.repository import (
     create_contract_graph,
+    create_contract_graphs_bulk,
     find_impacted_products_by_supplier_delay,
 )
@@ -5,46 +5,65 @@
 # GraphDB instance via its SPARQL endpoint.
 #
 # ╔══════════════════════════════════════════════════════════╗
-# ║  GOLDEN RULE #1 — STATELESS CONNECTION                  ║
-# ║  Unlike Neo4j's persistent driver, SPARQLWrapper is      ║
-# ║  stateless.  Each request is an independent HTTP call.   ║
-# ║  There is NO socket pool to manage and NO session to     ║
-# ║  close.  The class below simply centralises the endpoint ║
-# ║  URL so every module uses the same configuration.        ║
+# ║  GOLDEN RULE #1 — ONE SHARED HTTP SESSION                ║
+# ║  GraphDB speaks the plain SPARQL 1.1 HTTP protocol, so   ║
+# ║  there is no driver or transaction to manage.  We do     ║
+# ║  keep ONE long-lived requests.Session per process so     ║
+# ║  every query reuses a pooled keep-alive connection       ║
+# ║  instead of paying a fresh TCP (and TLS) handshake on    ║
+# ║  each call.  The session holds no query state, so it is  ║
+# ║  safe to share across the FastAPI executor threads.      ║
 # ╚══════════════════════════════════════════════════════════╝
 #
 # Usage:
-#   from knowledge_base.connection import graphdb
-#   results = graphdb.execute_sparql_select("SELECT …")
-#   graphdb.execute_sparql_update("INSERT DATA { … }")
+#   from knowledge_base.connection import get_graphdb
+#   results = get_graphdb().execute_sparql_select("SELECT …")
+#   get_graphdb().execute_sparql_update("INSERT DATA { … }")
 # ============================================================
 
+import hashlib
+import logging
 import os
-import json
+import time
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from typing import Iterator
+
+import requests
 from dotenv import load_dotenv
-from SPARQLWrapper import SPARQLWrapper, JSON, POST, DIGEST
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPDigestAuth
+
+# ---- Optional tracing ----
+# If OpenTelemetry is installed, every GraphDB call becomes a
+# span; otherwise timings are only written to the debug log.
+try:
+    from opentelemetry import trace
+except ImportError:
+    trace = None
 
 # ---- Load .env file ----
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+_tracer = trace.get_tracer("graphdb") if trace is not None else None
+
+# Media type of the standard SPARQL 1.1 JSON results format
+SPARQL_RESULTS_JSON = "application/sparql-results+json"
+
 
 class GraphDBConnection:
     """
-    A thin, **stateless** wrapper around SPARQLWrapper.
+    A thin wrapper around a pooled ``requests.Session`` that
+    speaks the SPARQL 1.1 protocol to GraphDB.
 
     Responsibilities
     ----------------
     - Read the GraphDB endpoint URL from the .env file.
     - Build the correct SPARQL and SPARQL-Update endpoint URLs.
-    - Provide `execute_sparql_select()` for SELECT / ASK queries.
+    - Provide `execute_sparql_select()` for SELECT queries.
     - Provide `execute_sparql_update()` for INSERT / DELETE queries.
-
-    Why no close() method?
-    ----------------------
-    SPARQLWrapper uses plain HTTP requests under the hood.
-    There is no persistent connection, no socket pool, and
-    therefore nothing to close.  Each method call is a fresh
-    HTTP round-trip to the GraphDB REST API.
+    - Provide `close()` to release the pooled sockets on shutdown.
     """
 
     def __init__(self):
@@ -66,32 +85,144 @@ class GraphDBConnection:
         self._query_endpoint = f"{graphdb_url}/repositories/{graphdb_repo}"
         self._update_endpoint = f"{graphdb_url}/repositories/{graphdb_repo}/statements"
 
+        # ---- Connection pool tuning ----
+        # pool_size should be >= the number of executor threads that
+        # may query GraphDB at once; extra sockets beyond it are
+        # opened on demand and discarded after use.
+        #   GRAPHDB_POOL_SIZE=50
+        #   GRAPHDB_CONNECT_TIMEOUT=15   (seconds to open a socket)
+        #   GRAPHDB_READ_TIMEOUT=60      (seconds to wait for a reply)
+        self.pool_size = int(os.getenv("GRAPHDB_POOL_SIZE", 50))
+        self._timeout = (
+            float(os.getenv("GRAPHDB_CONNECT_TIMEOUT", 15.0)),
+            float(os.getenv("GRAPHDB_READ_TIMEOUT", 60.0)),
+        )
+
+        # ---- Shared HTTP session (connection pool) ----
+        # Sockets are kept alive between requests.  urllib3 checks
+        # whether a pooled socket was dropped by the server before
+        # reusing it, so long-idle connections are replaced rather
+        # than failing the next query.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        # Set auth only if credentials are provided
+        if self._user and self._password:
+            self._session.auth = HTTPDigestAuth(self._user, self._password)
+
+    @property
+    def query_endpoint(self) -> str:
+        """The repository's SPARQL query URL (safe to log)."""
+        return self._query_endpoint
+
     # ----------------------------------------------------------
-    # _get_sparql_wrapper() — build a fresh wrapper per request
+    # _observe() — time (and optionally trace) one GraphDB call
     # ----------------------------------------------------------
-    def _get_sparql_wrapper(self, endpoint: str, is_update: bool = False) -> SPARQLWrapper:
+    @contextmanager
+    def _observe(self, operation: str, query: str) -> Iterator[dict]:
         """
-        Create a new SPARQLWrapper instance for a single request.
+        Measure a single GraphDB call with ``perf_counter_ns``.
 
-        This is intentionally created fresh every time
-        (Golden Rule #1: Stateless Connection).
+        The caller may set ``stats["rows"]`` inside the block.  The
+        duration, a stable short hash of the query text and the row
+        count are logged at DEBUG level and, when OpenTelemetry is
+        available, attached to a ``graphdb.<operation>`` span.
         """
-        sparql = SPARQLWrapper(endpoint)
+        query_hash = hashlib.blake2s(query.encode(), digest_size=8).hexdigest()
+        stats: dict = {"rows": None}
 
-        if is_update:
-            sparql.setMethod(POST)
+        span_cm = (
+            _tracer.start_as_current_span(
+                f"graphdb.{operation}",
+                attributes={"db.system": "graphdb", "sparql.hash": query_hash},
+            )
+            if _tracer is not None
+            else nullcontext()
+        )
 
-        # Set auth only if credentials are provided
-        if self._user and self._password:
-            sparql.setCredentials(self._user, self._password)
-            sparql.setHTTPAuth(DIGEST)
+        start = time.perf_counter_ns()
+        with span_cm as span:
+            try:
+                yield stats
+            finally:
+                elapsed_ms = (time.perf_counter_ns() - start) / 1_000_000
+                if span is not None and stats["rows"] is not None:
+                    span.set_attribute("sparql.rows", stats["rows"])
+                logger.debug(
+                    "GraphDB %s [%s] took %.1f ms (rows=%s)",
+                    operation,
+                    query_hash,
+                    elapsed_ms,
+                    stats["rows"],
+                )
+
+    # ----------------------------------------------------------
+    # _post() — send one SPARQL protocol request
+    # ----------------------------------------------------------
+    def _post(
+        self,
+        endpoint: str,
+        data: dict,
+        accept: str | None = None,
+        read_timeout: float | None = None,
+    ) -> requests.Response:
+        """
+        POST a form-encoded SPARQL protocol request over the
+        shared session and raise on any non-2xx status.
+
+        ``read_timeout`` overrides GRAPHDB_READ_TIMEOUT for this
+        one request; the connect timeout is unchanged.
 
-        return sparql
+        Raises
+        ------
+        requests.HTTPError
+            On a non-2xx status.  The message includes GraphDB's
+            response body (e.g. ``MALFORMED QUERY: …``) so callers
+            such as the chat self-correction loop can act on it.
+        """
+        headers = {"Accept": accept} if accept else None
+        timeout = self._timeout if read_timeout is None else (self._timeout[0], read_timeout)
+        response = self._session.post(
+            endpoint, data=data, headers=headers, timeout=timeout
+        )
+        if not response.ok:
+            raise requests.HTTPError(
+                f"GraphDB returned {response.status_code} {response.reason}: "
+                f"{response.text.strip()}",
+                response=response,
+            )
+        return response
 
     # ----------------------------------------------------------
-    # execute_sparql_select() — run a SELECT / ASK query
+    # verify_connectivity() — cheap reachability probe
     # ----------------------------------------------------------
-    def execute_sparql_select(self, query: str) -> list[dict]:
+    def verify_connectivity(self) -> bool:
+        """
+        Send a trivial ASK query to confirm GraphDB is reachable.
+
+        Returns
+        -------
+        bool
+            True if the repository answered the probe.
+
+        Raises
+        ------
+        Exception
+            If GraphDB cannot be reached or rejects the query.
+        """
+        response = self._post(
+            self._query_endpoint,
+            {"query": "ASK { }"},
+            accept=SPARQL_RESULTS_JSON,
+        ).json()
+        return "boolean" in response
+
+    # ----------------------------------------------------------
+    # execute_sparql_select() — run a SELECT query
+    # ----------------------------------------------------------
+    def execute_sparql_select(self, query: str, single: bool = False) -> list[dict] | dict | None:
         """
         Execute a SPARQL SELECT query and return the result
         bindings as a list of dictionaries.
@@ -99,34 +230,49 @@ class GraphDBConnection:
         Parameters
         ----------
         query : str
-            A SPARQL SELECT or ASK query string.
+            A SPARQL SELECT query string.  ASK is not supported:
+            its response has a ``boolean`` instead of ``results``.
+        single : bool
+            If True, only the first binding is converted and
+            returned (or None when there are no results).  Use
+            this for ``LIMIT 1`` lookups to skip building a list.
 
         Returns
         -------
-        list[dict]
+        list[dict] | dict | None
             Each dict maps variable names to their values.
             Example: [{"supplier": "Acme", "material": "Steel"}]
         """
-        sparql = self._get_sparql_wrapper(self._query_endpoint)
-        sparql.setQuery(query)
-        sparql.setReturnFormat(JSON)
+        with self._observe("select", query) as stats:
+            response = self._post(
+                self._query_endpoint,
+                {"query": query},
+                accept=SPARQL_RESULTS_JSON,
+            ).json()
 
-        response = sparql.query().convert()
+            # Parse the standard SPARQL JSON response format
+            bindings = response["results"]["bindings"]
+            stats["rows"] = len(bindings)
 
-        # Parse the standard SPARQL JSON response format
-        results = []
-        for binding in response["results"]["bindings"]:
-            row = {}
-            for var_name, var_data in binding.items():
-                row[var_name] = var_data["value"]
-            results.append(row)
+        if single:
+            if not bindings:
+                return None
+            return {var_name: var_data["value"] for var_name, var_data in bindings[0].items()}
 
-        return results
+        return [
+            {var_name: var_data["value"] for var_name, var_data in binding.items()}
+            for binding in bindings
+        ]
 
     # ----------------------------------------------------------
     # execute_sparql_update() — run an INSERT / DELETE update
     # ----------------------------------------------------------
-    def execute_sparql_update(self, update_query: str) -> bool:
+    def execute_sparql_update(
+        self,
+        update_query: str,
+        timeout: float | None = None,
+        rows: int | None = None,
+    ) -> bool:
         """
         Execute a SPARQL UPDATE (INSERT DATA / DELETE DATA, etc.).
 
@@ -134,6 +280,13 @@ class GraphDBConnection:
         ----------
         update_query : str
             A SPARQL UPDATE statement.
+        timeout : float | None
+            Seconds to wait for GraphDB's reply.  Defaults to
+            GRAPHDB_READ_TIMEOUT.
+        rows : int | None
+            Number of records the update writes (e.g. contracts in
+            a bulk INSERT).  Only reported in the timing log / span;
+            the SPARQL protocol does not return a count.
 
         Returns
         -------
@@ -145,18 +298,52 @@ class GraphDBConnection:
         Exception
             If GraphDB returns an error status code.
         """
-        sparql = self._get_sparql_wrapper(self._update_endpoint, is_update=True)
-        sparql.setQuery(update_query)
+        # GraphDB returns 204 on success; _post raises otherwise
+        with self._observe("update", update_query) as stats:
+            stats["rows"] = rows
+            self._post(self._update_endpoint, {"update": update_query}, read_timeout=timeout)
+        return True
 
-        # SPARQLWrapper sends the update; GraphDB returns 204 on success
-        response = sparql.query()
+    # ----------------------------------------------------------
+    # close() — release pooled keep-alive sockets
+    # ----------------------------------------------------------
+    def close(self) -> None:
+        """
+        Close the shared session and every idle pooled socket.
+
+        Nothing is flushed or committed here — each SPARQL
+        request is already complete when its call returns.
+        """
+        self._session.close()
+
+
+# ==============================================================
+# Transient error classification
+# ==============================================================
+def is_transient_error(exc: Exception) -> bool:
+    """
+    Return True if ``exc`` is worth one retry.
+
+    Covers connection failures (including a pooled socket that
+    the server closed while idle) and HTTP 503 from a GraphDB
+    that is briefly overloaded.  Query errors (4xx) and read
+    timeouts are NOT retried.
+    """
+    if isinstance(exc, requests.ConnectionError):
         return True
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return exc.response.status_code == 503
+    return False
 
 
 # ==============================================================
-# Module-level singleton
+# Lazily-created shared instance
 # ==============================================================
-# Even though the connection is stateless, we use a singleton
-# so that every module shares the SAME endpoint configuration.
-# No sockets are held open — this is just a config object.
-graphdb = GraphDBConnection()
+# Every module shares the SAME endpoint configuration and the
+# SAME connection pool.  The instance is only built on first
+# use, so importing this module reads no settings and opens no
+# sockets — tests can import it without touching GraphDB.
+@lru_cache(maxsize=1)
+def get_graphdb() -> GraphDBConnection:
+    """Return the process-wide GraphDBConnection, creating it on first call."""
+    return GraphDBConnection()
@@ -17,9 +17,17 @@
 # ╚══════════════════════════════════════════════════════════╝
 # ============================================================
 
-from knowledge_base.connection import graphdb
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from knowledge_base.connection import get_graphdb, is_transient_error
 from models.schemas import SLAContract
 
+logger = logging.getLogger(__name__)
+
 # ---- Shared Namespace Prefix Block ----
 # This prefix block is prepended to every SPARQL query to
 # guarantee namespace consistency across the whole system.
@@ -39,18 +47,214 @@ PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
 CONTRACT_GRAPH = "http://example.org/contracts/"
 
 
+def _normalize_sparql(raw: str) -> str:
+    """
+    Canonicalise a SPARQL template: drop full-line ``#`` comments
+    and collapse all whitespace runs to a single space.
+
+    Only comments that start a line are removed, so the ``#`` in
+    IRIs such as ``<http://example.org/ontology#>`` is preserved.
+    Run this on constant templates at import time, never on text
+    that already contains user-supplied literals.
+    """
+    without_comments = re.sub(r"(?m)^\s*#[^\n]*$", "", raw)
+    return re.sub(r"\s+", " ", without_comments).strip()
+
+
+# Characters that are NOT kept verbatim in a local name, plus a
+# leading "-" / "." and a trailing "." (both illegal in PN_LOCAL).
+_UNSAFE_LOCAL_NAME = re.compile(r"[^A-Za-z0-9_.\-]|^[.\-]|\.\Z")
+
+
 def _sanitize_uri_fragment(name: str) -> str:
     """
     Convert a human-readable name into a safe URI fragment.
 
+    Spaces become ``_``; ASCII letters, digits, ``_``, ``-`` and
+    inner ``.`` are kept; every other character is percent-encoded
+    (UTF-8), which SPARQL allows in a prefixed local name.  The
+    result is therefore always a valid local name, cannot inject
+    SPARQL, and distinct names stay distinct individuals.
+
     Examples
     --------
     >>> _sanitize_uri_fragment("Stark Industries")
     'Stark_Industries'
     >>> _sanitize_uri_fragment("Cold-Rolled Steel")
     'Cold-Rolled_Steel'
+    >>> _sanitize_uri_fragment("U.S. Steel")
+    'U.S._Steel'
+    >>> _sanitize_uri_fragment("Acme, Inc.")
+    'Acme%2C_Inc%2E'
+    """
+    return _UNSAFE_LOCAL_NAME.sub(
+        lambda match: "".join(f"%{byte:02X}" for byte in match.group().encode("utf-8")),
+        name.strip().replace(" ", "_"),
+    )
+
+
+def _escape_sparql_literal(value: str) -> str:
+    """
+    Escape a string value for safe use inside a SPARQL quoted literal.
+
+    SPARQL string literals are delimited by double quotes.  If the
+    value itself contains double quotes, backslashes, or newlines
+    the query will break.  This function escapes those characters.
+
+    Examples
+    --------
+    >>> _escape_sparql_literal('2% deduction per day of delay')
+    '2% deduction per day of delay'
+    >>> _escape_sparql_literal('Penalty: "$500" per day')
+    'Penalty: \\"$500\\" per day'
+    """
+    escaped = value.replace("\\", "\\\\")
+    escaped = escaped.replace('"', '\\"')
+    escaped = escaped.replace("\n", "\\n")
+    escaped = escaped.replace("\r", "\\r")
+    return escaped
+
+
+# ---- Contract triple template ----
+# Built once at import time.  The placeholders are filled per
+# contract by _build_contract_triples() using _PARAM_MAP.
+# INSERT DATA writes every triple unconditionally — there is no
+# "created vs. matched" branch, so the SLA properties are set by
+# the same single statement whether or not the individuals exist.
+_RAW_NODE_TRIPLES = """
+            # ── Supplier individual ──
+            :{supplier_uri}  rdf:type       :Supplier ;
+                             rdfs:label     "{supplier_name}" .
+
+            # ── RawMaterial individual ──
+            :{material_uri}  rdf:type       :RawMaterial ;
+                             rdfs:label     "{material_name}" .
+"""
+_RAW_LINK_TRIPLES = """
+            # ── Relationship: Supplier supplies RawMaterial ──
+            :{supplier_uri}  :supplies      :{material_uri} .
+
+            # ── SLA Properties on the Supplier ──
+            :{supplier_uri}  :leadTimeDays  {lead_time_days} .
+            :{supplier_uri}  :penaltyClause "{penalty_clause}" .
+"""
+
+# The commented _RAW_* templates above are for humans; the
+# normalised versions below are what is actually sent, which
+# keeps every INSERT small and its text canonical.
+_NODE_TRIPLES = _normalize_sparql(_RAW_NODE_TRIPLES)
+_LINK_TRIPLES = _normalize_sparql(_RAW_LINK_TRIPLES)
+_CONTRACT_TRIPLES = f"{_NODE_TRIPLES} {_LINK_TRIPLES}"
+
+# (SLAContract field, template placeholder) pairs
+_PARAM_MAP = (
+    ("supplier_name", "supplier_name"),
+    ("material", "material_name"),
+    ("lead_time_days", "lead_time_days"),
+    ("penalty_clause", "penalty_clause"),
+)
+
+# Head / tail of the INSERT DATA statement around the triple blocks
+_CONTRACT_INSERT_HEAD = _normalize_sparql(f"""
+    {PREFIXES}
+
+    INSERT DATA {{
+        GRAPH <{CONTRACT_GRAPH}> {{
+""") + " "
+_CONTRACT_INSERT_TAIL = " } }"
+
+
+# ---- "Already written" cache for Supplier / RawMaterial ----
+# Remembers (supplier_name, material) pairs whose individuals this
+# process has already inserted, so repeat uploads only send the
+# relationship and SLA triples.  Bounded LRU, shared by executor
+# threads.  If the contracts graph is cleared while the server is
+# running, restart it so the individuals are written again.
+_ENSURED_NODES_MAXSIZE = 10_000
+_ensured_nodes: OrderedDict[tuple[str, str], None] = OrderedDict()
+_ensured_nodes_lock = threading.Lock()
+
+
+def _nodes_ensured(key: tuple[str, str]) -> bool:
+    """Return True (and refresh its LRU slot) if ``key`` was already written."""
+    with _ensured_nodes_lock:
+        if key in _ensured_nodes:
+            _ensured_nodes.move_to_end(key)
+            return True
+        return False
+
+
+def _mark_nodes_ensured(keys: list[tuple[str, str]]) -> None:
+    """Record ``keys`` as written, evicting the oldest beyond the cap."""
+    with _ensured_nodes_lock:
+        for key in keys:
+            _ensured_nodes[key] = None
+            _ensured_nodes.move_to_end(key)
+        while len(_ensured_nodes) > _ENSURED_NODES_MAXSIZE:
+            _ensured_nodes.popitem(last=False)
+
+
+def _build_contract_triples(contract: SLAContract, include_nodes: bool = True) -> str:
+    """
+    Build the Turtle-style triple block for a single SLA contract.
+
+    The block is meant to be placed inside a ``GRAPH <…> { }``
+    clause, so that one or many contracts can share a single
+    INSERT DATA statement.  With ``include_nodes=False`` only the
+    relationship and SLA triples are produced.
     """
-    return name.strip().replace(" ", "_")
+    fields = contract.__dict__
+    # String fields are escaped so one bad row cannot break (or
+    # inject into) the INSERT DATA shared with the rest of a batch.
+    params = {
+        key: _escape_sparql_literal(fields[field]) if isinstance(fields[field], str) else fields[field]
+        for field, key in _PARAM_MAP
+    }
+    params["supplier_uri"] = _sanitize_uri_fragment(contract.supplier_name)
+    params["material_uri"] = _sanitize_uri_fragment(contract.material)
+    template = _CONTRACT_TRIPLES if include_nodes else _LINK_TRIPLES
+    return template.format_map(params)
+
+
+# Seconds to wait for a single-contract INSERT before giving up.
+# Bulk chunks keep GRAPHDB_READ_TIMEOUT: a 200-contract INSERT on
+# a reasoning-enabled repository can legitimately take longer,
+# and a read timeout is not retried, so a chunk GraphDB later
+# commits would otherwise be reported as failed.
+CONTRACT_WRITE_TIMEOUT = float(os.getenv("GRAPHDB_WRITE_TIMEOUT", 5.0))
+
+
+def _execute_contract_update(
+    sparql_update: str,
+    rows: int,
+    timeout: float | None = CONTRACT_WRITE_TIMEOUT,
+) -> None:
+    """
+    Send a contract INSERT DATA, retrying once on a transient error.
+
+    INSERT DATA has set semantics, so replaying it after a dropped
+    connection cannot duplicate triples.  Any other error — or a
+    second transient failure — is raised to the caller.  ``rows``
+    is the number of contracts in the statement, reported in the
+    timing log.  Pass ``timeout=None`` to use the connection's
+    default read timeout.
+    """
+    graphdb = get_graphdb()
+    try:
+        graphdb.execute_sparql_update(sparql_update, timeout=timeout, rows=rows)
+    except Exception as exc:
+        if not is_transient_error(exc):
+            raise
+        logger.warning("Transient GraphDB error on contract insert (%s); retrying once.", exc)
+        graphdb.execute_sparql_update(sparql_update, timeout=timeout, rows=rows)
+
+
+def _build_contract_insert(triple_blocks: list[str]) -> str:
+    """
+    Wrap one or more triple blocks in a single SPARQL INSERT DATA
+    statement targeting the contracts Named Graph.
+    """
+    return _CONTRACT_INSERT_HEAD + " ".join(triple_blocks) + _CONTRACT_INSERT_TAIL
 
 
 def create_contract_graph(contract: SLAContract) -> dict:
@@ -76,49 +280,110 @@ def create_contract_graph(contract: SLAContract) -> dict:
         A confirmation dict with the supplier and material names.
     """
 
-    # ---- Build safe URI fragments ----
-    supplier_uri = _sanitize_uri_fragment(contract.supplier_name)
-    material_uri = _sanitize_uri_fragment(contract.material)
-
     # ---- SPARQL UPDATE query ----
     # We use INSERT DATA to add triples into the contracts
     # Named Graph.  All URIs use the ontology namespace (:)
     # to satisfy Golden Rule #2 (Namespace Consistency).
-    sparql_update = f"""
-    {PREFIXES}
+    # The Supplier / RawMaterial individuals are skipped when this
+    # process has already written them.
+    key = (contract.supplier_name, contract.material)
+    sparql_update = _build_contract_insert(
+        [_build_contract_triples(contract, include_nodes=not _nodes_ensured(key))]
+    )
 
-    INSERT DATA {{
-        GRAPH <{CONTRACT_GRAPH}> {{
+    # Execute the update (HTTP POST over the pooled GraphDB session)
+    _execute_contract_update(sparql_update, rows=1)
+    _mark_nodes_ensured([key])
 
-            # ── Supplier individual ──
-            :{supplier_uri}  rdf:type       :Supplier ;
-                             rdfs:label     "{contract.supplier_name}" .
+    return {
+        "supplier": contract.supplier_name,
+        "material": contract.material,
+        "graph": CONTRACT_GRAPH,
+        "message": "Triples inserted successfully into GraphDB.",
+    }
 
-            # ── RawMaterial individual ──
-            :{material_uri}  rdf:type       :RawMaterial ;
-                             rdfs:label     "{contract.material}" .
 
-            # ── Relationship: Supplier supplies RawMaterial ──
-            :{supplier_uri}  :supplies      :{material_uri} .
+def create_contract_graphs_bulk(contracts: list[SLAContract]) -> dict:
+    """
+    Persist many SLA contracts with ONE SPARQL INSERT DATA.
 
-            # ── SLA Properties on the Supplier ──
-            :{supplier_uri}  :leadTimeDays  {contract.lead_time_days} .
-            :{supplier_uri}  :penaltyClause "{contract.penalty_clause}" .
-        }}
-    }}
+    Every contract produces the same triples as
+    ``create_contract_graph()``, but all of them are sent to
+    GraphDB in a single HTTP round-trip instead of one request
+    per contract.
+
+    Parameters
+    ----------
+    contracts : list[SLAContract]
+        The validated Pydantic models coming from the API layer.
+
+    Returns
+    -------
+    dict
+        A confirmation dict with the number of contracts written
+        and the (supplier, material) pairs that were inserted.
     """
+    if not contracts:
+        return {
+            "count": 0,
+            "contracts": [],
+            "graph": CONTRACT_GRAPH,
+            "message": "No contracts supplied — nothing inserted.",
+        }
+
+    keys = [(contract.supplier_name, contract.material) for contract in contracts]
+    sparql_update = _build_contract_insert(
+        [
+            _build_contract_triples(contract, include_nodes=not _nodes_ensured(key))
+            for contract, key in zip(contracts, keys)
+        ]
+    )
 
-    # Execute the update (stateless HTTP POST to GraphDB)
-    graphdb.execute_sparql_update(sparql_update)
+    _execute_contract_update(sparql_update, rows=len(contracts), timeout=None)
+    _mark_nodes_ensured(keys)
 
     return {
-        "supplier": contract.supplier_name,
-        "material": contract.material,
+        "count": len(contracts),
+        "contracts": [
+            {"supplier": contract.supplier_name, "material": contract.material}
+            for contract in contracts
+        ],
         "graph": CONTRACT_GRAPH,
         "message": "Triples inserted successfully into GraphDB.",
     }
 
 
+# ---- Impacted-products query ----
+# Constant text, so it is normalised once at import time.
+_RAW_IMPACTED_PRODUCTS_QUERY = f"""
+{PREFIXES}
+
+SELECT ?supplierLabel ?materialLabel ?productLabel ?riskStatus
+WHERE {{
+    # ── Find suppliers that have declared a delay ──
+    ?supplier  rdf:type     :Supplier ;
+               rdfs:label   ?supplierLabel ;
+               :hasDelay    true .
+
+    # ── Find what material that supplier provides ──
+    ?supplier  :supplies    ?material .
+    ?material  rdfs:label   ?materialLabel .
+
+    # ── Find products that require that material ──
+    ?product   rdf:type     :Product ;
+               rdfs:label   ?productLabel ;
+               :requires    ?material .
+
+    # ── This triple is INFERRED by GraphDB's OWL reasoner ──
+    # It should NOT exist as explicit data; the reasoner
+    # derives it from the ontology axioms above.
+    ?product   :isAtRisk    ?riskStatus .
+}}
+ORDER BY ?productLabel
+"""
+_IMPACTED_PRODUCTS_QUERY = _normalize_sparql(_RAW_IMPACTED_PRODUCTS_QUERY)
+
+
 def find_impacted_products_by_supplier_delay() -> list[dict]:
     """
     SPARQL SELECT that demonstrates OWL Inference.
@@ -140,31 +405,4 @@ def find_impacted_products_by_supplier_delay() -> list[dict]:
         Each dict contains the product name and risk status.
     """
 
-    sparql_query = f"""
-    {PREFIXES}
-
-    SELECT ?supplierLabel ?materialLabel ?productLabel ?riskStatus
-    WHERE {{
-        # ── Find suppliers that have declared a delay ──
-        ?supplier  rdf:type     :Supplier ;
-                   rdfs:label   ?supplierLabel ;
-                   :hasDelay    true .
-
-        # ── Find what material that supplier provides ──
-        ?supplier  :supplies    ?material .
-        ?material  rdfs:label   ?materialLabel .
-
-        # ── Find products that require that material ──
-        ?product   rdf:type     :Product ;
-                   rdfs:label   ?productLabel ;
-                   :requires    ?material .
-
-        # ── This triple is INFERRED by GraphDB's OWL reasoner ──
-        # It should NOT exist as explicit data; the reasoner
-        # derives it from the ontology axioms above.
-        ?product   :isAtRisk    ?riskStatus .
-    }}
-    ORDER BY ?productLabel
-    """
-
-    return graphdb.execute_sparql_select(sparql_query)
+    return get_graphdb().execute_sparql_select(_IMPACTED_PRODUCTS_QUERY)
@@ -10,9 +10,18 @@
 from dotenv import load_dotenv
 load_dotenv()
 
+import asyncio
+import logging
+
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 from api.dashboard import router as dashboard_router
+from api.middleware import GZipRequestMiddleware
 from api.sandbox import router as sandbox_router
+from knowledge_base.connection import get_graphdb
+from services.lifting_service import shutdown_batch_executor
+
+logger = logging.getLogger(__name__)
 
 # --------------- App Initialization ---------------
 app = FastAPI(
@@ -23,28 +32,46 @@ app = FastAPI(
     version="0.2.0",
 )
 
+# --------------- Middleware ---------------
+# Compress large JSON responses (e.g. batch upload summaries)
+# and accept gzip-compressed request bodies.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+app.add_middleware(GZipRequestMiddleware)
+
 # --------------- Register Routers ---------------
 app.include_router(sandbox_router)
 app.include_router(dashboard_router)
 
 
 # --------------- Lifecycle Events ---------------
-# NOTE: SPARQLWrapper is stateless (Golden Rule #1).
-# There is NO persistent connection to close on shutdown.
-# We keep the event hook as a placeholder for future
-# cleanup tasks (e.g., clearing caches, flushing logs).
+# NOTE: GraphDB is reached over ONE pooled HTTP session
+# (Golden Rule #1).  The startup hook probes GraphDB once,
+# which also warms the connection pool, so a missing
+# instance shows up in the boot log instead of on the
+# first request.  It does NOT abort startup — the risk
+# engine and LLM pipelines still work in mock mode.
+@app.on_event("startup")
+async def startup_event():
+    """Probe GraphDB once without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    graphdb = get_graphdb()
+    try:
+        await loop.run_in_executor(None, graphdb.verify_connectivity)
+        logger.info("GraphDB reachable at %s", graphdb.query_endpoint)
+    except Exception as exc:
+        logger.warning("GraphDB is not reachable at startup: %s", exc)
+
+
 @app.on_event("shutdown")
-def shutdown_event():
-    """
-    Placeholder for shutdown cleanup.
-    GraphDB connections via SPARQLWrapper are stateless HTTP
-    requests — no socket pool or driver to close.
-    """
-    pass
+async def shutdown_event():
+    """Drain batch chunk writes, then release the pooled GraphDB sockets."""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, shutdown_batch_executor)
+    get_graphdb().close()
 
 
 # --------------- Root Health-Check ---------------
 @app.get("/")
-def read_root():
+async def read_root():
     """Simple health-check endpoint to verify the server is alive."""
     return {"message": "Hello Cavengers! The Backend is alive! (GraphDB Edition)"}
\ No newline at end of file
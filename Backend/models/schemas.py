@@ -9,7 +9,7 @@
 
 import uuid
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
 class SLAContract(BaseModel):
@@ -29,8 +29,14 @@ class SLAContract(BaseModel):
     penalty_clause : str
         Free-text description of the financial penalty
         applied when the SLA is violated.
+
+    The model is frozen (read-only once validated) and rejects
+    unknown fields, so a contract cannot change between
+    validation and being written to GraphDB.
     """
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     supplier_name: str = Field(
         ...,
         min_length=1,
@@ -57,6 +63,12 @@ class SLAContract(BaseModel):
     )
 
 
+# Prebuilt validator for JSON arrays of SLAContract.
+# Building a TypeAdapter compiles a validator, so it is done
+# once here and reused by every batch upload request.
+SLA_LIST_ADAPTER = TypeAdapter(list[SLAContract])
+
+
 class ExtractedSLAData(BaseModel):
     """
     Schema representing structured data extracted from an SLA contract
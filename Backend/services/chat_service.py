@@ -25,7 +25,7 @@ from langchain_core.prompts import ChatPromptTemplate
 from langgraph.graph import END, StateGraph
 from typing_extensions import TypedDict
 
-from knowledge_base.connection import graphdb
+from knowledge_base.connection import get_graphdb
 from knowledge_base.repository import PREFIXES
 from services.llm_service import LLMClient
 
@@ -65,7 +65,7 @@ def fetch_live_schema() -> str:
     }}
     """
     try:
-        results = graphdb.execute_sparql_select(schema_query)
+        results = get_graphdb().execute_sparql_select(schema_query)
         classes, obj_props, data_props = [], [], []
         for row in results:
             entity_type = row["type"]
@@ -201,7 +201,7 @@ def execute_sparql_node(state: ChatState) -> ChatState:
     logger.info("[Chat Node 2] Database Execution")
 
     try:
-        results = graphdb.execute_sparql_select(state["generated_sparql"])
+        results = get_graphdb().execute_sparql_select(state["generated_sparql"])
         logger.info("    Query successful. Found %d rows.", len(results))
         state["graph_results"] = results
         state["error_message"] = ""
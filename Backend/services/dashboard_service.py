@@ -8,7 +8,7 @@
 
 import logging
 
-from knowledge_base.connection import graphdb
+from knowledge_base.connection import get_graphdb
 from knowledge_base.repository import (
     PREFIXES,
     _sanitize_uri_fragment,
@@ -46,7 +46,7 @@ def get_compliance_alerts() -> list[dict]:
         OPTIONAL {{ ?supplier :penaltyClause ?penalty . }}
     }}
     """
-    return graphdb.execute_sparql_select(query)
+    return get_graphdb().execute_sparql_select(query)
 
 
 def get_impacted_products() -> list[dict]:
@@ -66,4 +66,4 @@ def get_fallback_options(material_id: str) -> list[dict]:
     }}
     ORDER BY DESC(?reliabilityScore)
     """
-    return graphdb.execute_sparql_select(query)
+    return get_graphdb().execute_sparql_select(query)
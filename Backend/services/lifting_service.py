@@ -17,16 +17,22 @@
 # ╚══════════════════════════════════════════════════════════╝
 # ============================================================
 
+import asyncio
 import logging
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Any
 
-from knowledge_base.connection import graphdb
+from knowledge_base.connection import get_graphdb
 from knowledge_base.repository import (
     CONTRACT_GRAPH,
     PREFIXES,
+    _escape_sparql_literal,
     _sanitize_uri_fragment,
     create_contract_graph,
+    create_contract_graphs_bulk,
 )
 from models.schemas import ConfirmedSLA, ExtractedSLAData, SLAContract
 
@@ -34,30 +40,10 @@ logger = logging.getLogger(__name__)
 
 
 # ==============================================================
-# 1. STRING ESCAPING FOR SPARQL LITERALS
+# 1. URI HELPERS
 # ==============================================================
-
-
-def _escape_sparql_literal(value: str) -> str:
-    """
-    Escape a string value for safe use inside a SPARQL quoted literal.
-
-    SPARQL string literals are delimited by double quotes.  If the
-    value itself contains double quotes, backslashes, or newlines
-    the query will break.  This function escapes those characters.
-
-    Examples
-    --------
-    >>> _escape_sparql_literal('2% deduction per day of delay')
-    '2% deduction per day of delay'
-    >>> _escape_sparql_literal('Penalty: "$500" per day')
-    'Penalty: \\"$500\\" per day'
-    """
-    escaped = value.replace("\\", "\\\\")
-    escaped = escaped.replace('"', '\\"')
-    escaped = escaped.replace("\n", "\\n")
-    escaped = escaped.replace("\r", "\\r")
-    return escaped
+# Literal escaping (_escape_sparql_literal) lives in
+# knowledge_base.repository so the contract writers share it.
 
 
 def _build_contract_id(document_id: str) -> str:
@@ -353,7 +339,7 @@ INSERT DATA {{
             Confirmation dictionary with execution status.
         """
         try:
-            graphdb.execute_sparql_update(sparql)
+            get_graphdb().execute_sparql_update(sparql)
             logger.info("SPARQL INSERT executed successfully against %s.", CONTRACT_GRAPH)
             return {
                 "status": "success",
@@ -378,6 +364,91 @@ def save_sla_contract(contract: SLAContract) -> dict:
     return create_contract_graph(contract)
 
 
+def save_sla_contracts_bulk(contracts: list[SLAContract]) -> dict:
+    return create_contract_graphs_bulk(contracts)
+
+
+# Contracts per INSERT DATA when a batch upload is split up
+SLA_BATCH_CHUNK_SIZE = int(os.getenv("SLA_BATCH_CHUNK_SIZE", 200))
+
+
+@lru_cache(maxsize=1)
+def _get_batch_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide executor for batch chunk writes.
+
+    It has one thread per GraphDB pooled connection, so however
+    many batch uploads arrive at once, at most ``pool_size``
+    chunk INSERTs are in flight; further chunks queue here.
+    """
+    return ThreadPoolExecutor(
+        max_workers=get_graphdb().pool_size,
+        thread_name_prefix="sla-batch",
+    )
+
+
+def shutdown_batch_executor() -> None:
+    """
+    Wait for in-flight batch chunk writes, then stop the executor.
+
+    Call this on application shutdown BEFORE closing the GraphDB
+    session.  Does nothing if no batch upload ever created it.
+    """
+    if _get_batch_executor.cache_info().currsize:
+        _get_batch_executor().shutdown(wait=True)
+        _get_batch_executor.cache_clear()
+
+
+async def save_sla_contracts_concurrently(contracts: list[SLAContract]) -> dict:
+    """
+    Persist a batch upload as several bulk INSERTs running in parallel.
+
+    The batch is split into chunks of ``SLA_BATCH_CHUNK_SIZE``
+    contracts.  Each chunk is one ``save_sla_contracts_bulk()``
+    call on the shared batch executor, which caps concurrent
+    chunk writes across ALL batch requests at ``pool_size``.
+    A failed chunk does not cancel the others.
+
+    Returns
+    -------
+    dict
+        ``count`` / ``failed`` contract totals, the ``contracts``
+        that were written, the number of successful ``updates``,
+        and an ``errors`` list with one message per failed chunk.
+    """
+    loop = asyncio.get_running_loop()
+    executor = _get_batch_executor()
+    chunks = [
+        contracts[i:i + SLA_BATCH_CHUNK_SIZE]
+        for i in range(0, len(contracts), SLA_BATCH_CHUNK_SIZE)
+    ]
+
+    async def _write(chunk: list[SLAContract]) -> dict:
+        return await loop.run_in_executor(executor, save_sla_contracts_bulk, chunk)
+
+    results = await asyncio.gather(*(_write(chunk) for chunk in chunks), return_exceptions=True)
+
+    summary: dict[str, Any] = {
+        "count": 0,
+        "failed": 0,
+        "updates": 0,
+        "contracts": [],
+        "graph": CONTRACT_GRAPH,
+        "errors": [],
+    }
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, Exception):
+            logger.error("Bulk SLA chunk of %d contract(s) failed: %s", len(chunk), result)
+            summary["failed"] += len(chunk)
+            summary["errors"].append(str(result))
+        else:
+            summary["count"] += result["count"]
+            summary["updates"] += 1
+            summary["contracts"].extend(result["contracts"])
+
+    return summary
+
+
 # ==============================================================
 # 3. MODULE-LEVEL SINGLETON INSTANCE
 # ==============================================================
@@ -79,7 +79,7 @@ def fetch_sla_node(state: RiskEngineState) -> RiskEngineState:
 
     # ── Attempt real GraphDB query ──────────────────────────
     try:
-        from knowledge_base.connection import graphdb
+        from knowledge_base.connection import get_graphdb
 
         sparql_query = f"""
         PREFIX : <http://example.org/ontology#>
@@ -91,9 +91,8 @@ def fetch_sla_node(state: RiskEngineState) -> RiskEngineState:
         }}
         LIMIT 1
         """
-        results = graphdb.execute_sparql_select(sparql_query)
-        if results:
-            row = results[0]
+        row = get_graphdb().execute_sparql_select(sparql_query, single=True)
+        if row:
             sla_data = {
                 "lead_time_days": int(row.get("leadTimeDays", 3)),
                 "delay_penalty_rate": float(
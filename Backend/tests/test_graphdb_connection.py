@@ -27,7 +27,7 @@ import os
 # Ensure the project root is on the Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from knowledge_base.connection import graphdb
+from knowledge_base.connection import get_graphdb
 
 # ---- Shared Prefix Block ----
 PREFIXES = """
@@ -58,9 +58,9 @@ def test_connection():
         WHERE {{ ?s ?p ?o }}
         LIMIT 1
         """
-        results = graphdb.execute_sparql_select(query)
+        results = get_graphdb().execute_sparql_select(query)
         print(f"  ✅  Connection successful!")
-        print(f"      Endpoint: {graphdb._query_endpoint}")
+        print(f"      Endpoint: {get_graphdb().query_endpoint}")
         print(f"      Sample triple found: {len(results) > 0}")
         return True
 
@@ -95,7 +95,7 @@ def test_insert_triples():
             }}
         }}
         """
-        graphdb.execute_sparql_update(insert_query)
+        get_graphdb().execute_sparql_update(insert_query)
         print("  ✅  INSERT DATA executed successfully.")
 
         # ---- VERIFY ----
@@ -112,7 +112,7 @@ def test_insert_triples():
         }}
         LIMIT 5
         """
-        results = graphdb.execute_sparql_select(verify_query)
+        results = get_graphdb().execute_sparql_select(verify_query)
         print(f"  ✅  Verification query returned {len(results)} result(s):")
         for row in results:
             print(f"      • {row['supplierLabel']} → {row['materialLabel']}")
@@ -162,7 +162,7 @@ def test_inference_validation():
         }}
         """
 
-        results = graphdb.execute_sparql_select(inference_query)
+        results = get_graphdb().execute_sparql_select(inference_query)
 
         if len(results) == 0:
             print("  ⚠️  No 'At Risk' products found.")
@@ -202,7 +202,7 @@ def test_inference_validation():
         }}
         """
 
-        inferred_results = graphdb.execute_sparql_select(inferred_check_query)
+        inferred_results = get_graphdb().execute_sparql_select(inferred_check_query)
 
         all_inferred = True
         for row in inferred_results:
@@ -245,7 +245,7 @@ def cleanup_test_data():
             }}
         }}
         """
-        graphdb.execute_sparql_update(cleanup_query)
+        get_graphdb().execute_sparql_update(cleanup_query)
         print("  ✅  Test data cleaned up.")
         return True
 
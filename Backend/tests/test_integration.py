@@ -53,6 +53,20 @@ def test_model_imports():
     c = SLAContract(supplier_name="S1", material="M1", lead_time_days=3, penalty_clause="5%")
     check(c.supplier_name == "S1", "SLAContract instantiation")
 
+    from pydantic import ValidationError
+
+    try:
+        c.lead_time_days = 5
+        check(False, "SLAContract is frozen")
+    except ValidationError:
+        check(True, "SLAContract is frozen")
+
+    try:
+        SLAContract(supplier_name="S1", material="M1", lead_time_days=3, penalty_clause="5%", extra="x")
+        check(False, "SLAContract rejects unknown fields")
+    except ValidationError:
+        check(True, "SLAContract rejects unknown fields")
+
     # ExtractedSLAData
     e = ExtractedSLAData(
         document_id="DOC-001",
@@ -132,6 +146,28 @@ def test_llmclient_singleton():
     return True
 
 
+# ==============================================================
+# 2b. GRAPHDB LAZY ACCESSOR
+# ==============================================================
+
+
+def test_graphdb_accessor():
+    print("\n" + "=" * 60)
+    print("TEST: GraphDB connection lazy accessor")
+    print("=" * 60)
+
+    import knowledge_base.connection as connection
+
+    check(not hasattr(connection, "graphdb"), "No connection is built at import time")
+
+    g1 = connection.get_graphdb()
+    g2 = connection.get_graphdb()
+    check(g1 is g2, "get_graphdb returns the same object")
+    check(g1.query_endpoint.endswith("/repositories/" + os.getenv("GRAPHDB_REPO", "supply-chain")), "query_endpoint is public")
+
+    return True
+
+
 # ==============================================================
 # 3. FALLBACK GENERATION
 # ==============================================================
@@ -397,6 +433,7 @@ def test_sandbox_router_wiring():
 
     routes = [r.path for r in router.routes]
     check("/api/sandbox/upload-sla" in routes, "POST /upload-sla registered")
+    check("/api/sandbox/upload-sla-batch" in routes, "POST /upload-sla-batch registered")
     check("/api/sandbox/upload-pdf" in routes, "POST /upload-pdf registered")
     check("/api/sandbox/confirm-sla" in routes, "POST /confirm-sla registered")
     check("/api/sandbox/simulate-iot" in routes, "POST /simulate-iot registered")
@@ -462,6 +499,470 @@ def test_initial_state_construction():
     return True
 
 
+# ==============================================================
+# 15. BULK CONTRACT INSERT
+# ==============================================================
+
+
+def test_bulk_contract_insert():
+    print("\n" + "=" * 60)
+    print("TEST: Bulk contract INSERT DATA construction")
+    print("=" * 60)
+
+    from knowledge_base.repository import (
+        _build_contract_insert,
+        _build_contract_triples,
+    )
+    from models.schemas import SLAContract
+
+    contracts = [
+        SLAContract(supplier_name="Acme Corp", material="Titanium", lead_time_days=3, penalty_clause="5%"),
+        SLAContract(supplier_name="Globex", material="Cold Steel", lead_time_days=7, penalty_clause="2%"),
+    ]
+    sparql = _build_contract_insert([_build_contract_triples(c) for c in contracts])
+
+    check(sparql.count("INSERT DATA") == 1, "Single INSERT DATA for the whole batch")
+    check("# ──" not in sparql and "\n" not in sparql, "Template comments and newlines stripped")
+    check("PREFIX : <http://example.org/ontology#>" in sparql, "IRI '#' survives normalisation")
+    check(":Acme_Corp :supplies :Titanium" in sparql, "First contract triples present")
+    check(":Globex :supplies :Cold_Steel" in sparql, "Second contract triples present")
+
+    slim = _build_contract_triples(contracts[0], include_nodes=False)
+    check(":Supplier" not in slim, "Slim block skips the Supplier individual")
+    check(":Acme_Corp :leadTimeDays 3" in slim, "Slim block keeps the SLA properties")
+
+    from models.schemas import SLA_LIST_ADAPTER
+
+    decoded = SLA_LIST_ADAPTER.validate_json(
+        '[{"supplier_name": "Acme Corp", "material": "Titanium",'
+        ' "lead_time_days": 3, "penalty_clause": "5%"}]'
+    )
+    check(decoded == contracts[:1], "SLA_LIST_ADAPTER decodes a JSON array")
+
+    return True
+
+
+# ==============================================================
+# 16. GZIP REQUEST DECOMPRESSION
+# ==============================================================
+
+
+def test_gzip_request_middleware():
+    print("\n" + "=" * 60)
+    print("TEST: gzip request body decompression")
+    print("=" * 60)
+
+    import gzip
+
+    from fastapi.testclient import TestClient
+    from main import app
+
+    client = TestClient(app)
+    headers = {"Content-Encoding": "gzip", "Content-Type": "application/json"}
+
+    # An invalid contract is rejected by validation before touching
+    # GraphDB, which proves the body was inflated and parsed.
+    body = gzip.compress(b'[{"supplier_name": "Acme", "material": "Ti", "lead_time_days": 0, "penalty_clause": "5%"}]')
+    response = client.post("/api/sandbox/upload-sla-batch", content=body, headers=headers)
+    check(response.status_code == 422, "gzip JSON body is inflated and validated")
+
+    response = client.post("/api/sandbox/upload-sla-batch", content=b"not gzip", headers=headers)
+    check(response.status_code == 400, "Corrupt gzip body returns 400")
+
+    return True
+
+
+# ==============================================================
+# 16b. BULK CONTRACT INSERT — ROW ISOLATION
+# ==============================================================
+
+
+def test_bulk_contract_row_isolation():
+    print("\n" + "=" * 60)
+    print("TEST: One bad row cannot break or inject into a batch")
+    print("=" * 60)
+
+    from knowledge_base.repository import (
+        _build_contract_insert,
+        _build_contract_triples,
+        _sanitize_uri_fragment,
+    )
+    from models.schemas import SLAContract
+
+    hostile = SLAContract(
+        supplier_name="Evil",
+        material="Ti",
+        lead_time_days=1,
+        penalty_clause='x" . } } ; DROP ALL ; INSERT DATA { GRAPH <urn:g> { :a :b "',
+    )
+    sparql = _build_contract_insert([_build_contract_triples(hostile)])
+    check('"x\\" . } } ; DROP ALL' in sparql, "Quote in penalty clause is escaped")
+    check(sparql.endswith(':a :b \\"" . } }'), "Injected text stays inside the literal")
+
+    check(_sanitize_uri_fragment("Acme, Inc.") == "Acme%2C_Inc%2E", "Punctuation percent-encoded in URI fragment")
+    check(_sanitize_uri_fragment("A> ; DROP ALL") == "A%3E_%3B_DROP_ALL", "URI fragment cannot close the IRI")
+    check(_sanitize_uri_fragment("-Steel") == "%2DSteel", "Leading hyphen made valid")
+    check(_sanitize_uri_fragment("Steel²") == "Steel%C2%B2", "Non-ASCII characters percent-encoded")
+    check(
+        _sanitize_uri_fragment("Acme, Inc.") != _sanitize_uri_fragment("Acme; Inc."),
+        "Distinct names map to distinct URIs",
+    )
+    check(_sanitize_uri_fragment("U.S. Steel") == "U.S._Steel", "Inner dots keep existing URIs unchanged")
+
+    from rdflib.plugins.sparql import prepareUpdate
+
+    odd_names = ["Steel²", "Acme, Inc.", "Acme; Inc.", "U.S. Steel", "-½ Alloy.", "50% Ni"]
+    batch = _build_contract_insert(
+        [
+            _build_contract_triples(SLAContract(supplier_name=name, material=name, lead_time_days=1, penalty_clause="-"))
+            for name in odd_names
+        ]
+    )
+    try:
+        prepareUpdate(batch)
+        check(True, "Batch with unusual names parses as SPARQL")
+    except Exception as exc:
+        check(False, f"Batch with unusual names parses as SPARQL ({exc})")
+
+    return True
+
+
+# ==============================================================
+# 16c. BATCH UPLOAD — PARTIAL FAILURE AGGREGATION
+# ==============================================================
+
+
+def test_batch_upload_partial_failure():
+    print("\n" + "=" * 60)
+    print("TEST: Batch upload aggregates per-chunk failures")
+    print("=" * 60)
+
+    from fastapi.testclient import TestClient
+
+    import services.lifting_service as lifting_service
+    from main import app
+
+    def fake_bulk(chunk):
+        if any(c.supplier_name == "Bad" for c in chunk):
+            raise RuntimeError("chunk rejected")
+        return {
+            "count": len(chunk),
+            "contracts": [{"supplier": c.supplier_name, "material": c.material} for c in chunk],
+        }
+
+    def row(supplier):
+        return {"supplier_name": supplier, "material": "Ti", "lead_time_days": 1, "penalty_clause": "5%"}
+
+    original_bulk = lifting_service.save_sla_contracts_bulk
+    original_chunk = lifting_service.SLA_BATCH_CHUNK_SIZE
+    lifting_service.save_sla_contracts_bulk = fake_bulk
+    lifting_service.SLA_BATCH_CHUNK_SIZE = 2
+    try:
+        client = TestClient(app)
+
+        response = client.post("/api/sandbox/upload-sla-batch", json=[row("A"), row("B"), row("Bad")])
+        body = response.json()
+        check(response.status_code == 200, "Partial failure still returns 200")
+        check(body["status"] == "partial", "Status is 'partial'")
+        check(body["count"] == 2 and body["failed"] == 1, "Written / failed counts aggregated")
+        check(body["graph_data"]["updates"] == 1, "Only successful updates are counted")
+        check(body["graph_data"]["errors"] == ["chunk rejected"], "Chunk error reported")
+
+        response = client.post("/api/sandbox/upload-sla-batch", json=[row("Bad")])
+        check(response.status_code == 500, "Returns 500 when nothing was written")
+    finally:
+        lifting_service.save_sla_contracts_bulk = original_bulk
+        lifting_service.SLA_BATCH_CHUNK_SIZE = original_chunk
+
+    return True
+
+
+# ==============================================================
+# 17. GRAPHDB ERROR BODY PROPAGATION
+# ==============================================================
+
+
+def _stub_response(status_code: int, body: str, reason: str = ""):
+    """Build a ``requests.Response`` without touching the network."""
+    import requests
+
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = reason
+    response._content = body.encode()
+    response.headers["Content-Type"] = "application/sparql-results+json"
+    return response
+
+
+def test_graphdb_error_body():
+    print("\n" + "=" * 60)
+    print("TEST: GraphDB error body is kept in the exception")
+    print("=" * 60)
+
+    import requests
+
+    from knowledge_base.connection import GraphDBConnection
+
+    conn = GraphDBConnection()
+    conn._session.post = lambda *a, **kw: _stub_response(
+        400, "MALFORMED QUERY: Lexical error at line 1", "Bad Request"
+    )
+
+    try:
+        conn.execute_sparql_select("SELEC ?x")
+        check(False, "Non-2xx response raises HTTPError")
+    except requests.HTTPError as exc:
+        check(True, "Non-2xx response raises HTTPError")
+        check("MALFORMED QUERY: Lexical error" in str(exc), "Exception text contains GraphDB's message")
+        check(exc.response.status_code == 400, "HTTPError keeps the response")
+
+    return True
+
+
+# ==============================================================
+# 18. CONTRACT WRITE RETRY POLICY
+# ==============================================================
+
+
+def test_contract_write_retry():
+    print("\n" + "=" * 60)
+    print("TEST: Contract writes retry once on transient errors only")
+    print("=" * 60)
+
+    import requests
+
+    from knowledge_base import repository
+    from knowledge_base.connection import get_graphdb
+    from models.schemas import SLAContract
+
+    graphdb = get_graphdb()
+    original_post = graphdb._session.post
+    contract = SLAContract(supplier_name="Retry Co", material="Ti", lead_time_days=1, penalty_clause="5%")
+
+    def scripted(*outcomes):
+        calls = []
+
+        def post(*args, **kwargs):
+            calls.append(kwargs.get("timeout"))
+            outcome = outcomes[len(calls) - 1]
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        graphdb._session.post = post
+        return calls
+
+    try:
+        calls = scripted(_stub_response(503, "busy", "Service Unavailable"), _stub_response(204, ""))
+        repository.create_contract_graph(contract)
+        check(len(calls) == 2, "503 then success: retried exactly once")
+        check(calls[0][1] == repository.CONTRACT_WRITE_TIMEOUT, "Single write uses CONTRACT_WRITE_TIMEOUT")
+
+        calls = scripted(_stub_response(400, "MALFORMED QUERY", "Bad Request"))
+        try:
+            repository.create_contract_graph(contract)
+            check(False, "4xx is raised without retry")
+        except requests.HTTPError:
+            check(len(calls) == 1, "4xx is raised without retry")
+
+        calls = scripted(requests.ReadTimeout("slow"))
+        try:
+            repository.create_contract_graph(contract)
+            check(False, "Read timeout is raised without retry")
+        except requests.ReadTimeout:
+            check(len(calls) == 1, "Read timeout is raised without retry")
+
+        calls = scripted(_stub_response(204, ""))
+        repository.create_contract_graphs_bulk([contract])
+        check(calls[0] == graphdb._timeout, "Bulk write keeps the default read timeout")
+    finally:
+        graphdb._session.post = original_post
+        repository._ensured_nodes.clear()
+
+    return True
+
+
+# ==============================================================
+# 19. SINGLE-ROW SELECT
+# ==============================================================
+
+
+def test_select_single_row():
+    print("\n" + "=" * 60)
+    print("TEST: execute_sparql_select(single=True)")
+    print("=" * 60)
+
+    import json
+
+    from knowledge_base.connection import GraphDBConnection
+
+    def results(*rows):
+        bindings = [{k: {"type": "literal", "value": v} for k, v in row.items()} for row in rows]
+        return json.dumps({"head": {"vars": ["x"]}, "results": {"bindings": bindings}})
+
+    conn = GraphDBConnection()
+
+    conn._session.post = lambda *a, **kw: _stub_response(200, results())
+    check(conn.execute_sparql_select("SELECT ?x {}", single=True) is None, "Empty result returns None")
+    check(conn.execute_sparql_select("SELECT ?x {}") == [], "Empty result list without single")
+
+    conn._session.post = lambda *a, **kw: _stub_response(200, results({"x": "first"}, {"x": "second"}))
+    check(conn.execute_sparql_select("SELECT ?x {}", single=True) == {"x": "first"}, "single=True returns the first row")
+    check(len(conn.execute_sparql_select("SELECT ?x {}")) == 2, "All rows returned without single")
+
+    return True
+
+
+# ==============================================================
+# 20. WRITE ROW COUNTS IN THE TIMING LOG
+# ==============================================================
+
+
+def test_update_row_count():
+    print("\n" + "=" * 60)
+    print("TEST: Contract writes report their row count")
+    print("=" * 60)
+
+    import logging
+
+    from knowledge_base import repository
+    from knowledge_base.connection import get_graphdb, logger as connection_logger
+    from models.schemas import SLAContract
+
+    class Capture(logging.Handler):
+        def __init__(self):
+            super().__init__(logging.DEBUG)
+            self.rows = []
+
+        def emit(self, record):
+            self.rows.append(record.args[-1])
+
+    graphdb = get_graphdb()
+    original_post = graphdb._session.post
+    original_level = connection_logger.level
+    handler = Capture()
+    connection_logger.addHandler(handler)
+    connection_logger.setLevel(logging.DEBUG)
+    graphdb._session.post = lambda *a, **kw: _stub_response(204, "")
+
+    contracts = [
+        SLAContract(supplier_name=f"Rows {i}", material="Ni", lead_time_days=1, penalty_clause="-")
+        for i in range(3)
+    ]
+    try:
+        repository.create_contract_graphs_bulk(contracts)
+        repository.create_contract_graph(contracts[0])
+        check(handler.rows == [3, 1], "Bulk and single writes log rows=len(contracts) and rows=1")
+    finally:
+        graphdb._session.post = original_post
+        connection_logger.removeHandler(handler)
+        connection_logger.setLevel(original_level)
+        repository._ensured_nodes.clear()
+
+    return True
+
+
+# ==============================================================
+# 21. SUPPLIER / MATERIAL "ALREADY WRITTEN" CACHE
+# ==============================================================
+
+
+def test_ensured_nodes_cache():
+    print("\n" + "=" * 60)
+    print("TEST: Supplier / RawMaterial individuals written once per process")
+    print("=" * 60)
+
+    from knowledge_base import repository
+    from knowledge_base.connection import get_graphdb
+    from models.schemas import SLAContract
+
+    graphdb = get_graphdb()
+    original_post = graphdb._session.post
+    original_maxsize = repository._ENSURED_NODES_MAXSIZE
+    sent = []
+
+    def post(endpoint, data, **kwargs):
+        sent.append(data["update"])
+        return _stub_response(204, "")
+
+    def contract(supplier):
+        return SLAContract(supplier_name=supplier, material="Cu", lead_time_days=2, penalty_clause="1%")
+
+    repository._ensured_nodes.clear()
+    graphdb._session.post = post
+    try:
+        repository.create_contract_graph(contract("Cache Co"))
+        repository.create_contract_graph(contract("Cache Co"))
+        check(":Supplier" in sent[0] and ":RawMaterial" in sent[0], "First write includes the individuals")
+        check(":Supplier" not in sent[1] and ":RawMaterial" not in sent[1], "Repeat write skips the individuals")
+        check(":Cache_Co :leadTimeDays 2" in sent[1], "Repeat write keeps the SLA properties")
+
+        graphdb._session.post = lambda *a, **kw: _stub_response(400, "MALFORMED QUERY", "Bad Request")
+        try:
+            repository.create_contract_graph(contract("Failed Co"))
+        except Exception:
+            pass
+        check(("Failed Co", "Cu") not in repository._ensured_nodes, "Failed write is not cached")
+
+        graphdb._session.post = post
+        repository._ENSURED_NODES_MAXSIZE = 2
+        repository.create_contract_graphs_bulk([contract("LRU A"), contract("LRU B")])
+        repository.create_contract_graph(contract("LRU A"))
+        repository.create_contract_graph(contract("LRU C"))
+        check(list(repository._ensured_nodes) == [("LRU A", "Cu"), ("LRU C", "Cu")], "LRU evicts the least recently used pair")
+        repository.create_contract_graph(contract("LRU B"))
+        check(":Supplier" in sent[-1], "Evicted pair writes its individuals again")
+    finally:
+        graphdb._session.post = original_post
+        repository._ENSURED_NODES_MAXSIZE = original_maxsize
+        repository._ensured_nodes.clear()
+
+    return True
+
+
+# ==============================================================
+# 22. BATCH EXECUTOR SHUTDOWN
+# ==============================================================
+
+
+def test_batch_executor_shutdown():
+    print("\n" + "=" * 60)
+    print("TEST: Batch executor drains before the GraphDB session closes")
+    print("=" * 60)
+
+    import threading
+
+    from fastapi.testclient import TestClient
+
+    import main
+    from knowledge_base.connection import get_graphdb
+    from services import lifting_service
+
+    lifting_service.shutdown_batch_executor()
+    check(lifting_service._get_batch_executor.cache_info().currsize == 0, "No executor until a batch upload")
+
+    graphdb = get_graphdb()
+    original_close = graphdb.close
+    events = []
+    release = threading.Event()
+
+    def slow_chunk():
+        release.wait(5)
+        events.append("chunk done")
+
+    graphdb.close = lambda: events.append("session closed")
+    try:
+        with TestClient(main.app):
+            lifting_service._get_batch_executor().submit(slow_chunk)
+            threading.Timer(0.2, release.set).start()
+        check(events == ["chunk done", "session closed"], "In-flight chunk finishes before close()")
+        check(lifting_service._get_batch_executor.cache_info().currsize == 0, "Executor released on shutdown")
+    finally:
+        graphdb.close = original_close
+
+    return True
+
+
 # ==============================================================
 # RUNNER
 # ==============================================================
@@ -472,6 +973,7 @@ if __name__ == "__main__":
 
     test_model_imports()
     test_llmclient_singleton()
+    test_graphdb_accessor()
     test_fallback_generation()
     test_extraction_pipeline_topology()
     test_risk_engine_topology()
@@ -484,6 +986,16 @@ if __name__ == "__main__":
     test_sandbox_router_wiring()
     test_sparql_injection_safety()
     test_initial_state_construction()
+    test_bulk_contract_insert()
+    test_gzip_request_middleware()
+    test_bulk_contract_row_isolation()
+    test_batch_upload_partial_failure()
+    test_graphdb_error_body()
+    test_contract_write_retry()
+    test_select_single_row()
+    test_update_row_count()
+    test_ensured_nodes_cache()
+    test_batch_executor_shutdown()
 
     total = PASS + FAIL
     print("\n" + "=" * 60)